@@ -1,9 +1,61 @@
-"""Tests for the State class."""
+"""Tests for the State class.
+
+Tests share session-scoped fixtures, so each test must remain free of
+side effects.
+"""
+
+import json
+from collections.abc import Mapping
+from types import MappingProxyType
 
 import pytest
 from pydantic import ValidationError
 
-from aifand import Actuator, Sensor, State
+from aifand import Actuator, Device, Sensor, State
+
+
+@pytest.fixture(scope="session")
+def temp_sensor() -> Sensor:
+    """Provide a shared CPU temperature sensor."""
+    return Sensor(name="cpu_temp", properties={"value": 45.0, "unit": "°C"})
+
+
+@pytest.fixture(scope="session")
+def fan_actuator() -> Actuator:
+    """Provide a shared CPU fan actuator."""
+    return Actuator(name="cpu_fan", properties={"value": 128, "unit": "PWM"})
+
+
+@pytest.fixture(scope="session")
+def voltage_sensor() -> Sensor:
+    """Provide a shared voltage sensor."""
+    return Sensor(name="voltage", properties={"value": 12.0})
+
+
+@pytest.fixture(scope="session")
+def thermal_actuator() -> Actuator:
+    """Provide a shared thermal limit actuator."""
+    return Actuator(name="thermal_limit", properties={"value": 85})
+
+
+@pytest.fixture(scope="session")
+def empty_state() -> State:
+    """Provide a shared state with no devices."""
+    return State()
+
+
+@pytest.fixture(scope="session")
+def two_devices(
+    temp_sensor: Sensor, fan_actuator: Actuator
+) -> Mapping[str, Device]:
+    """Provide a read-only mapping of the CPU sensor and fan by name."""
+    return MappingProxyType({"cpu_temp": temp_sensor, "cpu_fan": fan_actuator})
+
+
+@pytest.fixture(scope="session")
+def two_device_state(two_devices: Mapping[str, Device]) -> State:
+    """Provide a shared state holding the CPU sensor and fan."""
+    return State(devices=two_devices)
 
 
 class TestState:
@@ -17,37 +69,31 @@ class TestState:
         assert state.device_count() == 0
         assert state.device_names() == []
 
-    def test_state_creation_with_devices(self) -> None:
+    def test_state_creation_with_devices(
+        self,
+        temp_sensor: Sensor,
+        fan_actuator: Actuator,
+        two_devices: Mapping[str, Device],
+    ) -> None:
         """Test creating a state with initial devices."""
-        temp_sensor = Sensor(
-            name="cpu_temp", properties={"value": 45.0, "unit": "°C"}
-        )
-        fan_actuator = Actuator(
-            name="cpu_fan", properties={"value": 128, "unit": "PWM"}
-        )
-
-        devices = {"cpu_temp": temp_sensor, "cpu_fan": fan_actuator}
-        state = State(devices=devices)
+        state = State(devices=dict(two_devices))
 
-        assert state.device_count() == 2
-        assert "cpu_temp" in state.device_names()
-        assert "cpu_fan" in state.device_names()
+        assert set(state.device_names()) == {"cpu_temp", "cpu_fan"}
         assert state.get_device("cpu_temp") == temp_sensor
         assert state.get_device("cpu_fan") == fan_actuator
 
-    def test_state_immutability(self) -> None:
+    def test_state_immutability(self, empty_state: State) -> None:
         """Test that states cannot be modified after creation."""
-        temp_sensor = Sensor(name="cpu_temp", properties={"value": 45.0})
-        state = State(devices={"cpu_temp": temp_sensor})
-
-        # State should be frozen
-        with pytest.raises(ValidationError):
-            state.devices = {}
-
-    def test_state_device_access(self) -> None:
+        with pytest.raises(ValidationError, match="frozen"):
+            empty_state.devices = {}
+
+    def test_state_device_access(
+        self,
+        temp_sensor: Sensor,
+        two_device_state: State,
+    ) -> None:
         """Test device access methods."""
-        temp_sensor = Sensor(name="cpu_temp", properties={"value": 45.0})
-        state = State(devices={"cpu_temp": temp_sensor})
+        state = two_device_state
 
         # Test get_device
         assert state.get_device("cpu_temp") == temp_sensor
@@ -58,46 +104,48 @@ class TestState:
         assert state.has_device("nonexistent") is False
 
         # Test device_names and device_count
-        assert state.device_names() == ["cpu_temp"]
-        assert state.device_count() == 1
+        assert set(state.device_names()) == {"cpu_temp", "cpu_fan"}
+        assert state.device_count() == 2
 
-    def test_state_with_device(self) -> None:
+    def test_state_with_device(
+        self,
+        temp_sensor: Sensor,
+        fan_actuator: Actuator,
+        empty_state: State,
+        two_device_state: State,
+    ) -> None:
         """Test adding/updating devices with with_device."""
-        original_sensor = Sensor(name="cpu_temp", properties={"value": 45.0})
-        state = State(devices={"cpu_temp": original_sensor})
+        state = empty_state.with_device(temp_sensor)
 
         # Add a new device
-        fan_actuator = Actuator(name="cpu_fan", properties={"value": 128})
         new_state = state.with_device(fan_actuator)
 
         # Original state unchanged
-        assert state.device_count() == 1
-        assert not state.has_device("cpu_fan")
+        assert set(state.device_names()) == {"cpu_temp"}
 
         # New state has both devices
-        assert new_state.device_count() == 2
-        assert new_state.has_device("cpu_temp")
-        assert new_state.has_device("cpu_fan")
+        assert set(new_state.device_names()) == {"cpu_temp", "cpu_fan"}
         assert new_state.get_device("cpu_fan") == fan_actuator
+        assert new_state == two_device_state
 
         # Update existing device
         updated_sensor = Sensor(name="cpu_temp", properties={"value": 50.0})
         updated_state = new_state.with_device(updated_sensor)
 
-        assert updated_state.device_count() == 2
-        assert updated_state.get_device("cpu_temp") == updated_sensor
-        assert updated_state.get_device("cpu_temp") != original_sensor
+        assert set(updated_state.device_names()) == {"cpu_temp", "cpu_fan"}
+        updated_device = updated_state.get_device("cpu_temp")
+        assert updated_device == updated_sensor
+        assert updated_device != temp_sensor
 
-    def test_state_with_devices(self) -> None:
+    def test_state_with_devices(
+        self,
+        empty_state: State,
+        two_devices: Mapping[str, Device],
+    ) -> None:
         """Test adding/updating multiple devices with with_devices."""
-        original_state = State()
+        original_state = empty_state
 
-        devices = {
-            "cpu_temp": Sensor(name="cpu_temp", properties={"value": 45.0}),
-            "cpu_fan": Actuator(name="cpu_fan", properties={"value": 128}),
-        }
-
-        new_state = original_state.with_devices(devices)
+        new_state = original_state.with_devices(dict(two_devices))
 
         # Original state unchanged
         assert original_state.device_count() == 0
@@ -107,62 +155,50 @@ class TestState:
         assert new_state.has_device("cpu_temp")
         assert new_state.has_device("cpu_fan")
 
-    def test_state_without_device(self) -> None:
+    def test_state_without_device(self, two_device_state: State) -> None:
         """Test removing devices with without_device."""
-        devices = {
-            "cpu_temp": Sensor(name="cpu_temp", properties={"value": 45.0}),
-            "cpu_fan": Actuator(name="cpu_fan", properties={"value": 128}),
-        }
-        state = State(devices=devices)
+        state = two_device_state
 
         # Remove existing device
         new_state = state.without_device("cpu_fan")
 
         # Original state unchanged
-        assert state.device_count() == 2
-        assert state.has_device("cpu_fan")
+        assert set(state.device_names()) == {"cpu_temp", "cpu_fan"}
 
         # New state has device removed
-        assert new_state.device_count() == 1
-        assert new_state.has_device("cpu_temp")
-        assert not new_state.has_device("cpu_fan")
+        assert set(new_state.device_names()) == {"cpu_temp"}
 
         # Remove nonexistent device (should not error)
         same_state = new_state.without_device("nonexistent")
         assert same_state.device_count() == 1
 
-    def test_state_representation(self) -> None:
+    def test_state_representation(
+        self,
+        empty_state: State,
+        two_device_state: State,
+    ) -> None:
         """Test state string representation."""
         # Empty state
-        empty_state = State()
         assert "0 devices" in repr(empty_state)
 
         # State with devices
-        devices = {
-            "cpu_temp": Sensor(name="cpu_temp", properties={"value": 45.0}),
-            "cpu_fan": Actuator(name="cpu_fan", properties={"value": 128}),
-        }
-        state = State(devices=devices)
-        repr_str = repr(state)
+        repr_str = repr(two_device_state)
 
         assert "2 devices" in repr_str
         assert "cpu_temp" in repr_str
         assert "cpu_fan" in repr_str
 
-    def test_state_serialization(self) -> None:
+    def test_state_serialization(self, temp_sensor: Sensor) -> None:
         """Test state serialization and deserialization."""
-        temp_sensor = Sensor(
-            name="cpu_temp", properties={"value": 45.0, "unit": "°C"}
-        )
         original_state = State(devices={"cpu_temp": temp_sensor})
 
-        # Serialize to dict
-        state_dict = original_state.model_dump()
+        # Serialize to JSON and inspect the parsed structure
+        state_json = original_state.model_dump_json()
+        state_dict = json.loads(state_json)
         assert "devices" in state_dict
         assert "cpu_temp" in state_dict["devices"]
 
-        # Serialize to JSON and back
-        state_json = original_state.model_dump_json()
+        # Deserialize from JSON
         reconstructed_state = State.model_validate_json(state_json)
 
         assert (
@@ -177,13 +213,15 @@ class TestState:
         assert original_device.name == reconstructed_device.name
         assert original_device.properties == reconstructed_device.properties
 
-    def test_state_equality(self) -> None:
+    def test_state_equality(
+        self,
+        empty_state: State,
+        two_device_state: State,
+    ) -> None:
         """Test state equality comparison."""
-        temp_sensor = Sensor(name="cpu_temp", properties={"value": 45.0})
-
-        state1 = State(devices={"cpu_temp": temp_sensor})
-        state2 = State(devices={"cpu_temp": temp_sensor})
-        state3 = State()
+        state1 = two_device_state
+        state2 = State(devices=dict(two_device_state.devices))
+        state3 = empty_state
 
         # Same devices should be equal
         assert state1 == state2
@@ -191,82 +229,47 @@ class TestState:
         # Different device sets should not be equal
         assert state1 != state3
 
-    def test_state_get_sensors(self) -> None:
-        """Test getting sensors from a state."""
-        temp_sensor = Sensor(name="cpu_temp", properties={"value": 45.0})
-        voltage_sensor = Sensor(name="voltage", properties={"value": 12.0})
-        fan_actuator = Actuator(name="cpu_fan", properties={"value": 128})
-
-        state = State(
-            devices={
-                "cpu_temp": temp_sensor,
-                "voltage": voltage_sensor,
-                "cpu_fan": fan_actuator,
-            }
-        )
-
-        sensors = state.get_sensors()
-
-        assert len(sensors) == 2
-        assert "cpu_temp" in sensors
-        assert "voltage" in sensors
-        assert "cpu_fan" not in sensors
-        assert sensors["cpu_temp"] == temp_sensor
-        assert sensors["voltage"] == voltage_sensor
-
-    def test_state_get_actuators(self) -> None:
-        """Test getting actuators from a state."""
-        temp_sensor = Sensor(name="cpu_temp", properties={"value": 45.0})
-        fan_actuator = Actuator(name="cpu_fan", properties={"value": 128})
-        thermal_actuator = Actuator(
-            name="thermal_limit", properties={"value": 85}
-        )
-
-        state = State(
-            devices={
-                "cpu_temp": temp_sensor,
-                "cpu_fan": fan_actuator,
-                "thermal_limit": thermal_actuator,
-            }
-        )
-
-        actuators = state.get_actuators()
-
-        assert len(actuators) == 2
-        assert "cpu_fan" in actuators
-        assert "thermal_limit" in actuators
-        assert "cpu_temp" not in actuators
-        assert actuators["cpu_fan"] == fan_actuator
-        assert actuators["thermal_limit"] == thermal_actuator
-
-    def test_state_get_sensors_empty(self) -> None:
-        """Test getting sensors from a state with no sensors."""
-        fan_actuator = Actuator(name="cpu_fan", properties={"value": 128})
-        state = State(devices={"cpu_fan": fan_actuator})
-
-        sensors = state.get_sensors()
-
-        assert len(sensors) == 0
-        assert sensors == {}
-
-    def test_state_get_actuators_empty(self) -> None:
-        """Test getting actuators from a state with no actuators."""
-        temp_sensor = Sensor(name="cpu_temp", properties={"value": 45.0})
-        state = State(devices={"cpu_temp": temp_sensor})
-
-        actuators = state.get_actuators()
-
-        assert len(actuators) == 0
-        assert actuators == {}
-
-    def test_state_get_sensors_and_actuators_empty_state(self) -> None:
-        """Test getting sensors and actuators from an empty state."""
-        state = State()
+    @pytest.mark.parametrize(
+        ("devices", "accessor_name", "expected_keys"),
+        [
+            pytest.param(
+                ["temp_sensor", "voltage_sensor", "fan_actuator"],
+                "get_sensors",
+                {"cpu_temp", "voltage"},
+                id="sensors-mixed",
+            ),
+            pytest.param(
+                ["temp_sensor", "fan_actuator", "thermal_actuator"],
+                "get_actuators",
+                {"cpu_fan", "thermal_limit"},
+                id="actuators-mixed",
+            ),
+            pytest.param(
+                ["fan_actuator"], "get_sensors", set(), id="sensors-none"
+            ),
+            pytest.param(
+                ["temp_sensor"], "get_actuators", set(), id="actuators-none"
+            ),
+            pytest.param([], "get_sensors", set(), id="sensors-empty"),
+            pytest.param([], "get_actuators", set(), id="actuators-empty"),
+        ],
+    )
+    def test_get_devices_by_type(
+        self,
+        request: pytest.FixtureRequest,
+        devices: list[str],
+        accessor_name: str,
+        expected_keys: set[str],
+    ) -> None:
+        """Test filtering state devices by sensor or actuator type."""
+        device_map = {
+            device.name: device
+            for device in map(request.getfixturevalue, devices)
+        }
+        state = State(devices=device_map)
 
-        sensors = state.get_sensors()
-        actuators = state.get_actuators()
+        result = getattr(state, accessor_name)()
 
-        assert len(sensors) == 0
-        assert len(actuators) == 0
-        assert sensors == {}
-        assert actuators == {}
+        assert set(result) == expected_keys
+        for name in expected_keys:
+            assert result[name] == device_map[name]